@@ -1,4 +1,4 @@
-from .viz import Dataset, add_bias, light_rdbu, dark_bwr
+from .viz import Dataset, dark_bwr, plot_planar_image, _planar_grid, _planar_inputs
 from ..experiment.amf420mesh import AMF420Mesh
 import jax
 import jax.numpy as jnp
@@ -263,23 +263,15 @@ class ONN2D:
     def plot(self, plt, model: Model, ax=None, grid_points=50, sim: bool = False):
         if ax is None:
             ax = plt.axes()
-        x_min, y_min = -2.5, -2.5
-        x_max, y_max = 2.5, 2.5
-        xx, yy = np.meshgrid(np.linspace(x_min, x_max, grid_points), np.linspace(x_min, x_max, grid_points))
-
         # Predict the function value for the whole grid
-        inputs = []
-        for x, y in zip(xx.flatten(), yy.flatten()):
-            inputs.append([x, y])
-        inputs = add_bias(np.asarray(inputs, dtype=np.complex64))
+        xx, yy = _planar_grid(grid_points)
+        inputs = _planar_inputs(grid_points)
 
         Y_hat = model.predict(inputs)
-        Y_hat = [yhat[0] for yhat in Y_hat]
-        Z = np.array(Y_hat)
-        Z = Z.reshape(xx.shape)
+        Z = np.asarray(Y_hat)[:, 0].reshape(xx.shape)
 
-        # Plot the contour and training examples
-        plot_handle = ax.contourf(xx, yy, Z, 50, cmap=light_rdbu, linewidths=0)
+        # Plot the prediction image and training examples
+        plot_handle = plot_planar_image(ax, xx, yy, Z)
         plt.colorbar(ticks=[0, 0.2, 0.4, 0.6, 0.8, 1], mappable=plot_handle, ax=ax)
         plot_labels(ax, dataset=self.dataset, ys=self.y_sim if sim else self.y_onn)
         plot_labels(ax, dataset=self.dataset_test, ys=self.y_sim_test if sim else self.y_onn_test)
@@ -303,7 +295,7 @@ def accuracy(actual, predicted, experimental):
 def plot_labels(ax, dataset: Dataset, ys: np.ndarray):
     points_x = dataset.X.T[0, :]
     points_y = dataset.X.T[1, :]
-    labels = np.array(
-        [0 if yi[0] > yi[1] else 1 for yi in np.abs(ys)]).flatten()
+    abs_ys = np.abs(ys)
+    labels = np.where(abs_ys[:, 0] > abs_ys[:, 1], 0, 1)
     ax.scatter(points_x, points_y, c=labels, edgecolors='black', linewidths=0.1, s=20, cmap=dark_bwr, alpha=1)
 
@@ -3,28 +3,21 @@ import numpy as np
 import time
 
 
-def psk_hash(input_str):
-    hasher1 = hashlib.sha3_256()
-    hasher1.update(input_str)
+def _sha3_nibbles(input_bytes):
+    digest = np.frombuffer(hashlib.sha3_256(input_bytes).digest(), dtype=np.uint8)
+    x = np.empty(64)
+    x[0::2] = digest >> 4
+    x[1::2] = digest & 0x0F
+    return x
 
-    x = np.zeros(64)
-    for i in range(0, 64, 2):
-        j = i >> 1
-        x[i] = hasher1.digest()[j] >> 4
-        x[i + 1] = hasher1.digest()[j] & 0x0F
 
-    return x, np.array(x) / 16 * 2 * np.pi
+def psk_hash(input_str):
+    x = _sha3_nibbles(input_str)
+    return x, x / 16 * 2 * np.pi
 
 
 def pow_hash_matmul(M, input):
-    hasher1 = hashlib.sha3_256()
-    hasher1.update(input)
-
-    x = np.zeros(64)
-    for i in range(0, 64, 2):
-        j = i >> 1
-        x[i] = hasher1.digest()[j] >> 4
-        x[i + 1] = hasher1.digest()[j] & 0x0F
+    x = _sha3_nibbles(input)
 
     y = []
     for i in range(len(x)):
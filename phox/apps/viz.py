@@ -2,6 +2,7 @@ import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
 from collections import namedtuple
+from functools import lru_cache
 
 # comment out the below two lines if you have trouble getting the plots to work
 
@@ -12,10 +13,8 @@ warnings.filterwarnings('ignore')
 from sklearn.datasets import make_circles, make_moons, make_blobs, make_gaussian_quantiles
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.utils import to_categorical
-from matplotlib.patches import Polygon
-from matplotlib.collections import PatchCollection
+from matplotlib.collections import PolyCollection
 from dphox.demo import mesh
-from dphox import Pattern
 from scipy.special import softmax
 from simphox.circuit import triangular
 
@@ -27,8 +26,11 @@ Dataset = namedtuple('Dataset', ['X', 'y'])
 def add_bias(x, p=9, n=4):
     abs_sq_term = np.sum(x ** 2, axis=1)[:, np.newaxis]
     abs_sq_term[abs_sq_term > p] = p  # avoid nan in case it exists
-    normalized_bias_term = np.sqrt(p - abs_sq_term)
-    return np.hstack([x, normalized_bias_term / np.sqrt(n - 2) * np.ones((x.shape[0], n - 2), dtype=np.complex64)])
+    bias = np.sqrt(p - abs_sq_term) / np.sqrt(n - 2)
+    biased_x = np.empty((x.shape[0], x.shape[1] + n - 2), dtype=np.result_type(x, bias, np.complex64))
+    biased_x[:, :x.shape[1]] = x
+    biased_x[:, x.shape[1]:] = bias
+    return biased_x
 
 
 def get_planar_dataset_with_circular_bias(dataset_name, test_size=.2):
@@ -63,25 +65,16 @@ def cmap_map(function, cmap):
     step_dict = {}
     # Firt get the list of points where the segments start or end
     for key in ('red', 'green', 'blue'):
-        step_dict[key] = list(map(lambda x: x[0], cdict[key]))
-    step_list = sum(step_dict.values(), [])
-    step_list = np.array(list(set(step_list)))
+        step_dict[key] = np.array([x[0] for x in cdict[key]])
+    step_list = np.unique(np.hstack(list(step_dict.values())))
     # Then compute the LUT, and apply the function to the LUT
-    reduced_cmap = lambda step: np.array(cmap(step)[0:3])
-    old_LUT = np.array(list(map(reduced_cmap, step_list)))
-    new_LUT = np.array(list(map(function, old_LUT)))
+    old_LUT = cmap(step_list)[:, :3]
+    new_LUT = np.apply_along_axis(function, 1, old_LUT)
     # Now try to make a minimal segment definition of the new LUT
     cdict = {}
     for i, key in enumerate(['red', 'green', 'blue']):
-        this_cdict = {}
-        for j, step in enumerate(step_list):
-            if step in step_dict[key]:
-                this_cdict[step] = new_LUT[j, i]
-            elif new_LUT[j, i] != old_LUT[j, i]:
-                this_cdict[step] = new_LUT[j, i]
-        colorvector = list(map(lambda x: x + (x[1],), this_cdict.items()))
-        colorvector.sort()
-        cdict[key] = colorvector
+        keep = np.isin(step_list, step_dict[key]) | (new_LUT[:, i] != old_LUT[:, i])
+        cdict[key] = [(step, value, value) for step, value in zip(step_list[keep], new_LUT[keep, i])]
 
     return mpl.colors.LinearSegmentedColormap('colormap', cdict, 1024)
 
@@ -90,30 +83,68 @@ light_rdbu = cmap_map(lambda x: 0.5 * x + 0.5, plt.cm.RdBu)
 dark_bwr = cmap_map(lambda x: 0.75 * x, plt.cm.bwr)
 
 
+def _planar_grid(grid_points):
+    x_min, y_min = -2.5, -2.5
+    x_max, y_max = 2.5, 2.5
+    return np.meshgrid(np.linspace(x_min, x_max, grid_points), np.linspace(x_min, x_max, grid_points))
+
+
+@lru_cache(maxsize=8)
+def _planar_inputs(grid_points):
+    """Biased ONN inputs for every :code:`_planar_grid` point, cached since they only depend on :code:`grid_points`.
+
+    Args:
+        grid_points: Number of grid points along each axis
+
+    Returns:
+        Read-only biased ONN inputs, one row per (raveled) grid point
+
+    """
+    xx, yy = _planar_grid(grid_points)
+    inputs = add_bias(np.stack((xx.ravel(), yy.ravel()), axis=1).astype(np.complex64))
+    inputs.setflags(write=False)
+    return inputs
+
+
+def plot_planar_image(ax, xx, yy, Z):
+    """Plot grid predictions :code:`Z` as an image whose pixels are centered on the :code:`xx`, :code:`yy` samples.
+
+    Args:
+        ax: Axis on which to plot
+        xx: Meshgrid of x sample positions
+        yy: Meshgrid of y sample positions
+        Z: Predicted values in :math:`[0, 1]` at each sample
+
+    Returns:
+        The image handle (e.g. for a colorbar)
+
+    """
+    # imshow extents are pixel edges, so pad the outermost sample centers by half a grid step
+    half_dx = (xx[0, -1] - xx[0, 0]) / (xx.shape[1] - 1) / 2
+    half_dy = (yy[-1, 0] - yy[0, 0]) / (yy.shape[0] - 1) / 2
+    extent = (xx[0, 0] - half_dx, xx[0, -1] + half_dx, yy[0, 0] - half_dy, yy[-1, 0] + half_dy)
+    return ax.imshow(Z, origin='lower', extent=extent, cmap=light_rdbu, vmin=0, vmax=1,
+                     interpolation='bilinear', aspect='auto')
+
+
 def plot_planar_boundary(plt, dataset, model, ax=None, grid_points=50):
     if ax is None:
         ax = plt.axes()
-    x_min, y_min = -2.5, -2.5
-    x_max, y_max = 2.5, 2.5
-    xx, yy = np.meshgrid(np.linspace(x_min, x_max, grid_points), np.linspace(x_min, x_max, grid_points))
 
     # Predict the function value for the whole grid
-    inputs = []
-    for x, y in zip(xx.flatten(), yy.flatten()):
-        inputs.append([x, y])
-    inputs = add_bias(np.asarray(inputs, dtype=np.complex64))
+    xx, yy = _planar_grid(grid_points)
+    inputs = _planar_inputs(grid_points)
 
     Y_hat = model.predict(inputs)
-    Y_hat = [yhat[0] for yhat in Y_hat]
-    Z = np.array(Y_hat)
-    Z = Z.reshape(xx.shape)
+    Z = np.asarray(Y_hat)[:, 0].reshape(xx.shape)
 
-    # Plot the contour and training examples
-    plot_handle = ax.contourf(xx, yy, Z, 50, cmap=light_rdbu, linewidths=0)
+    # Plot the prediction image and training examples
+    plot_handle = plot_planar_image(ax, xx, yy, Z)
     plt.colorbar(ticks=[0, 0.2, 0.4, 0.6, 0.8, 1], mappable=plot_handle, ax=ax)
     points_x = dataset.X.T[0, :]
     points_y = dataset.X.T[1, :]
-    labels = np.array([0 if yi[0] > yi[1] else 1 for yi in np.abs(dataset.y)]).flatten()
+    abs_y = np.abs(dataset.y)
+    labels = np.where(abs_y[:, 0] > abs_y[:, 1], 0, 1)
 
     ax.set_ylabel(r'$x_2$', fontsize=16)
     ax.set_xlabel(r'$x_1$', fontsize=16)
@@ -127,12 +158,12 @@ def plot_planar_boundary_from_dataset(plt, dataset, params_list, iteration, ax=N
 
     xx, yy, Z = get_onn_contour_data(params_list, iteration)
 
-    # Plot the contour and training examples
-    levels = np.linspace(0, 1, 50)
-    plot_handle = ax.contourf(xx, yy, Z, 50, cmap=light_rdbu, linewidths=0, levels=levels)
+    # Plot the prediction image and training examples
+    plot_handle = plot_planar_image(ax, xx, yy, Z)
     points_x = dataset.X.T[0, :]
     points_y = dataset.X.T[1, :]
-    labels = np.array([0 if yi[0] > yi[1] else 1 for yi in np.abs(dataset.y)]).flatten()
+    abs_y = np.abs(dataset.y)
+    labels = np.where(abs_y[:, 0] > abs_y[:, 1], 0, 1)
 
     ax.set_ylabel(r'$x_2$', fontsize=16)
     ax.set_xlabel(r'$x_1$', fontsize=16)
@@ -142,10 +173,6 @@ def plot_planar_boundary_from_dataset(plt, dataset, params_list, iteration, ax=N
 
 
 def get_onn_contour_data(params_list, iteration, grid_points=50):
-    x_min, y_min = -2.5, -2.5
-    x_max, y_max = 2.5, 2.5
-    xx, yy = np.meshgrid(np.linspace(x_min, x_max, grid_points), np.linspace(x_min, x_max, grid_points))
-
     onn_layers = {'layer1': triangular(4),
                   'layer2': triangular(4),
                   'layer3': triangular(4)}
@@ -157,10 +184,8 @@ def get_onn_contour_data(params_list, iteration, grid_points=50):
         )
 
     # Predict the function value for the whole grid
-    inputs = []
-    for x, y in zip(xx.flatten(), yy.flatten()):
-        inputs.append([x, y])
-    inputs = add_bias(np.asarray(inputs, dtype=np.complex64))
+    xx, yy = _planar_grid(grid_points)
+    inputs = _planar_inputs(grid_points)
 
     def predict(vin):
         out = vin
@@ -170,65 +195,71 @@ def get_onn_contour_data(params_list, iteration, grid_points=50):
         return out
 
     Y_hat = predict(inputs).T
-    Y_hat = [yhat[0] for yhat in Y_hat]
-    Z = np.array(Y_hat)
-    Z = Z.reshape(xx.shape)
+    Z = np.asarray(Y_hat)[:, 0].reshape(xx.shape)
 
     return xx, yy, Z
 
-def plot_amf420_powers(ax, power_data, comparison_data=None, comparison_shift=1, cmap='hot'):
-    start_polys = [0, 0, 2, 4]
-    normed_powers = power_data / np.sum(power_data[6])
-    if comparison_data is not None:
-        normed_comparison_powers = comparison_data / np.sum(comparison_data[6])
 
-    mask = np.ones((11, 4))
+@lru_cache()
+def _amf420_geometry():
+    """Static AMF420 waveguide geometry, computed once and shared across plots.
 
-    for i, poly in enumerate(start_polys):
-        mask[:poly, i] = 0
-        if poly > 0:
-            mask[-poly:, i] = 0
-        mask[poly, i] = 2
-        mask[-poly - 1, i] = 3
+    Returns:
+        A tuple of waveguide vertex arrays, the (row, col) power location of each waveguide and the mesh bounds
+
+    """
+    start_polys = np.array([0, 0, 2, 4])
+    rows, cols = np.mgrid[:11, :4]
+    start, end = start_polys[cols], 10 - start_polys[cols]
 
-    locs = np.array(np.where(mask == 1)).T
-    left_locs = np.array(np.where(mask == 2)).T
-    right_locs = np.array(np.where(mask == 3)).T
+    # interior, left end and right end locations, each paired with the slice of path polygons that is drawn
+    loc_groups = (
+        (np.argwhere((rows > start) & (rows < end)), slice(None)),
+        (np.argwhere(rows == start), slice(2, None)),
+        (np.argwhere(rows == end), slice(None, -1))
+    )
 
     possible_paths = path_array[::-1][:4, 4:15]
 
-    multipolys = [possible_paths[r[1], r[0]] for r in locs]
-    multipolys += [possible_paths[r[1], r[0]][2:] for r in left_locs]
-    multipolys += [possible_paths[r[1], r[0]][:-1] for r in right_locs]
-    waveguides = [Polygon(poly.T) for multipoly in multipolys for poly in multipoly]
-    mesh = Pattern([poly for multipoly in multipolys for poly in multipoly])
+    locs = np.vstack([group_locs for group_locs, _ in loc_groups])
+    multipolys = [possible_paths[r[1], r[0]][drawn] for group_locs, drawn in loc_groups for r in group_locs]
+    waveguides = tuple(poly.T for multipoly in multipolys for poly in multipoly)
+    mesh_verts = np.vstack(waveguides)
+    bounds = (*np.min(mesh_verts, axis=0), *np.max(mesh_verts, axis=0))
+
+    # (row, col) power location for each individual waveguide polygon
+    poly_locs = np.repeat(locs, [len(mp) for mp in multipolys], axis=0)
+    return waveguides, poly_locs, bounds
+
+
+def plot_amf420_powers(ax, power_data, comparison_data=None, comparison_shift=1, cmap='hot'):
+    normed_powers = power_data / np.sum(power_data[6])
+    if comparison_data is not None:
+        normed_comparison_powers = comparison_data / np.sum(comparison_data[6])
+
+    waveguides, poly_locs, b = _amf420_geometry()
+    waveguides = list(waveguides)
     if comparison_data is not None:
-        shift = (comparison_shift + 1) * mesh.size[1]
-        waveguides += [Polygon(poly.T + np.hstack((np.zeros_like(poly.T[:, :1]), np.ones_like(poly.T[:, 1:]) * shift)))
-                       for multipoly in multipolys for poly in multipoly]
+        shift = (comparison_shift + 1) * (b[3] - b[1])
+        waveguides += [poly + (0, shift) for poly in waveguides]
 
-    powers = np.hstack([[normed_powers[r[0], r[1]]] * len(mp)
-                        for r, mp in zip(np.vstack((locs, left_locs, right_locs)), multipolys)])
+    powers = normed_powers[poly_locs[:, 0], poly_locs[:, 1]]
     if comparison_data is not None:
-        powers = np.hstack((powers, np.hstack([[normed_comparison_powers[r[0], r[1]]] * len(mp)
-                                               for r, mp in
-                                               zip(np.vstack((locs, left_locs, right_locs)), multipolys)])))
+        powers = np.hstack((powers, normed_comparison_powers[poly_locs[:, 0], poly_locs[:, 1]]))
     # powers = np.sqrt(powers)
 
-    wg_patches = PatchCollection(waveguides, cmap=cmap, lw=1, edgecolor='black')
+    wg_patches = PolyCollection(waveguides, cmap=cmap, lw=1, edgecolor='black')
     wg_patches.set_array(np.zeros_like(powers))
-    p_patches = PatchCollection(waveguides, cmap=cmap, lw=0.5)
+    p_patches = PolyCollection(waveguides, cmap=cmap, lw=0.5, edgecolor='face')
     p_patches.set_array(powers)
-    p_patches.set_edgecolor(mpl.cm.hot(powers))
     ax.add_collection(wg_patches)
     ax.add_collection(p_patches)
-    b = mesh.bounds
     ax.set_xlim(b[0] - 2, b[2] + 2)
     ax.set_ylim(b[1] - 2, b[3] * (1 + (comparison_data is not None)) + 20)
     ax.set_aspect('equal')
     p_patches.set_clim(0, 1)
-    ax.text(mesh.center[0], 32, 'Measured', ha='center', va='center')
-    ax.text(mesh.center[0], 64, 'Predicted', ha='center', va='center')
+    ax.text((b[0] + b[2]) / 2, 32, 'Measured', ha='center', va='center')
+    ax.text((b[0] + b[2]) / 2, 64, 'Predicted', ha='center', va='center')
     return p_patches
 
 
@@ -4,7 +4,6 @@ import numpy as np
 import time
 
 from skimage import measure
-from shapely.geometry import Polygon
 
 import logging
 logger = logging.getLogger()
@@ -104,10 +103,9 @@ class ActivePhotonicsImager:
         self.camera.set_integration_time(self.integration_time)
         img = self.camera.frame()
         time.sleep(0.2)
-        contours = [Polygon(np.fliplr(contour))
-                    for contour in measure.find_contours(img, threshold) if len(contour) > 3]
-        contours = [contour for contour in contours if contour.area > 2]
-        contour_centers = [(int(contour.centroid.y), int(contour.centroid.x)) for contour in contours]
+        contours = [np.fliplr(contour) for contour in measure.find_contours(img, threshold) if len(contour) > 3]
+        contours = [contour for contour in contours if np.abs(_signed_area(contour)) > 2]
+        contour_centers = [(int(centroid[1]), int(centroid[0])) for centroid in map(_centroid, contours)]
         return contour_centers
 
     def spot_saturation(self, center: Tuple[int, int], window_size: int = 10,
@@ -195,3 +193,15 @@ def _get_grating_spot(img: np.ndarray, center: Tuple[int, int], window_size: int
              center[1] - window_size:center[1] + window_size]
     power = np.sum(window)
     return power, window
+
+
+def _signed_area(points: np.ndarray) -> float:
+    x, y = points[:, 0], points[:, 1]
+    return np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y) / 2
+
+
+def _centroid(points: np.ndarray) -> np.ndarray:
+    x, y = points[:, 0], points[:, 1]
+    x_next, y_next = np.roll(x, -1), np.roll(y, -1)
+    cross = x * y_next - x_next * y
+    return np.array((np.sum((x + x_next) * cross), np.sum((y + y_next) * cross))) / (3 * np.sum(cross))
@@ -20,6 +20,7 @@ from ..instrumentation import XCamera
 from ..model.phase import PhaseCalibration
 
 path_array, ps_array = mesh.demo_polys()
+PATH_POLY_COUNTS = np.array([len(multipoly) for multipoly in path_array.flatten()])
 logger = logging.getLogger()
 logger.setLevel(logging.WARN)
 
@@ -99,6 +100,8 @@ class AMF420Mesh(ActivePhotonicsImager):
                                   ) for ps_dict in AMF420MESH_CONFIG['phis']]
         self.phis: Dict[Tuple[int, int], PhaseShifter] = {ps.grid_loc: ps for ps in self.phis}
         self.ps: Dict[Tuple[int, int], PhaseShifter] = {**self.thetas, **self.phis}
+        # (row, col) index arrays into the 6x19 mesh image for each phase shifter in self.ps
+        self._ps_grid_idx = tuple(np.array(list(self.ps)).T[::-1])
         self.interlayer_xy = interlayer_xy
         self.spot_xy = s = spot_xy
         self.interspot_xy = ixy = interspot_xy
@@ -143,26 +146,19 @@ class AMF420Mesh(ActivePhotonicsImager):
         """
         powers = []
         spots = []
-        s, ixy = self.spot_xy, self.interspot_xy
+        # spot centers are a single affine map of the (spot row, port) grid, shared by every layer
+        ports, spot_rows = np.meshgrid(np.arange(n), np.arange(3))
+        centers = np.stack((ports, spot_rows), axis=-1) * np.asarray(self.interspot_xy) + np.asarray(self.spot_xy)
         for m in range(n + 1):
             self.to_layer(3 * m if m < n else 3 * n - 2)
             time.sleep(wait_time)
             img = self.camera.frame()
-            if m < n:
-                powers.append(
-                    np.hstack([np.vstack([_get_grating_spot(img, center=(j * ixy[0] + s[0], i * ixy[1] + s[1]),
-                                                            window_size=window_size)[0]
-                                          for j in range(n)]) for i in range(3)]))
-                spots.append(np.hstack([np.vstack([_get_grating_spot(img, center=(j * ixy[0] + s[0], i * ixy[1] + s[1]),
-                                                                     window_size=window_size)[1] / np.sum(
-                    powers[-1][:, i])
-                                                   for j in range(n)]) for i in range(3)]))
-            else:
-                powers.append(np.vstack([_get_grating_spot(img, center=(j * ixy[0] + s[0], s[1]),
-                                                           window_size=window_size)[0] for j in range(n)]))
-                spots.append(np.vstack([_get_grating_spot(img, center=(j * ixy[0] + s[0], s[1]),
-                                                          window_size=window_size)[1] / np.sum(powers[-1])
-                                        for j in range(n)]))
+            grating_spots = [[_get_grating_spot(img, center=center, window_size=window_size) for center in row]
+                             for row in (centers if m < n else centers[:1])]
+            power = np.array([[spot[0] for spot in row] for row in grating_spots]).T
+            powers.append(power)
+            spots.append(np.hstack([np.vstack([spot[1] for spot in row]) / np.sum(power[:, i])
+                                    for i, row in enumerate(grating_spots)]))
         return np.fliplr(np.hstack(powers[::-1])), np.fliplr(np.hstack(spots[::-1]))
 
     def sweep(self, channel: int, layer: int, vlim: Tuple[float, float],
@@ -362,14 +358,17 @@ class AMF420Mesh(ActivePhotonicsImager):
 
     def mesh_panel(self, power_cmap: str = 'hot', ps_cmap: str = 'greens'):
         polys = [p.T for multipoly in path_array.flatten() for p in multipoly]
-        waveguides = hv.Polygons(polys).opts(data_aspect=1, frame_height=100,
-                                             ylim=(-10, mesh.size[1] + 10), xlim=(0, mesh.size[0]),
+        mesh_size = mesh.size
+        xlim, ylim = (0, mesh_size[0]), (-10, mesh_size[1] + 10)
+        label_offset = mzi.interport_distance / 2
+        waveguides = hv.Polygons(polys).opts(data_aspect=1, frame_height=100, ylim=ylim, xlim=xlim,
                                              color='black', line_width=2)
         phase_shift_polys = [p for p in ps_array]
-        labels = np.fliplr(np.fliplr(np.mgrid[0:6, 0:19]).reshape((2, -1)).T)
+        # (col, row) grid label of each phase shifter, rows counted from the top of the mesh
+        labels = np.stack(np.meshgrid(np.arange(19), np.arange(5, -1, -1)), axis=-1).reshape((-1, 2))
         centroids = [np.mean(poly, axis=0) for poly in ps_array]
 
-        text = hv.Overlay([hv.Text(centroid[0], centroid[1] + mzi.interport_distance / 2,
+        text = hv.Overlay([hv.Text(centroid[0], centroid[1] + label_offset,
                                    f'{label[0]},{label[1]}', fontsize=7)
                            for label, centroid in zip(list(labels), centroids) if tuple(label) in self.ps])
 
@@ -380,12 +379,12 @@ class AMF420Mesh(ActivePhotonicsImager):
             [{('x', 'y'): poly, 'phase_shift': z} for poly, z in zip(phase_shift_polys, data)], vdims='phase_shift'
         )
         powers = hv.DynamicMap(power_polys, streams=[self.power_pipe]).opts(
-            data_aspect=1, frame_height=200, ylim=(-10, mesh.size[1] + 10),
-            xlim=(0, mesh.size[0]), line_color='none', cmap=power_cmap, shared_axes=False
+            data_aspect=1, frame_height=200, ylim=ylim, xlim=xlim,
+            line_color='none', cmap=power_cmap, shared_axes=False
         )
         ps = hv.DynamicMap(ps_polys, streams=[self.ps_pipe]).opts(
-            data_aspect=1, frame_height=200, ylim=(-10, mesh.size[1] + 10),
-            xlim=(0, mesh.size[0]), line_color='none', cmap=ps_cmap, shared_axes=False, clim=(0, 2 * np.pi)
+            data_aspect=1, frame_height=200, ylim=ylim, xlim=xlim,
+            line_color='none', cmap=ps_cmap, shared_axes=False, clim=(0, 2 * np.pi)
         )
         self.power_pipe.send(np.full(len(polys), np.nan))
         self.ps_pipe.send(np.full(len(phase_shift_polys), np.nan))
@@ -408,11 +407,9 @@ class AMF420Mesh(ActivePhotonicsImager):
         powers, spots = self.mesh_img(6)
         powers[powers <= 0] = 0
         powers = np.flipud(np.sqrt(powers / np.max(powers)))
-        self.power_pipe.send([p for p, multipoly in zip(powers.flatten(), path_array.flatten())
-                              for _ in multipoly])
+        self.power_pipe.send(np.repeat(powers.flatten(), PATH_POLY_COUNTS))
         data = np.zeros((6, 19))
-        for loc in self.ps:
-            data[loc[1], loc[0]] = self.ps[loc].phase
+        data[self._ps_grid_idx] = [ps.phase for ps in self.ps.values()]
         self.ps_pipe.send(np.flipud(data).flatten())
 
     def set_transparent(self, bar: bool = True, theta_only: bool = False):
@@ -836,18 +833,19 @@ class AMF420Mesh(ActivePhotonicsImager):
 
     def matrix_prop(self, vs: np.ndarray, wait_time: float = 0.03, move_pause: float = 0.2):
         prop_data = []
+        input_powers = np.linalg.norm(vs, axis=-1) ** 2
         for col in (4, 7, 10, 13, 16):
             self.to_layer(col)
             prop_col_data = []
             time.sleep(move_pause)
-            for v in vs:
+            for v, input_power in zip(vs, input_powers):
                 self.set_input(v)
                 time.sleep(wait_time)
                 prop_col_data.append(np.stack([
                     self.fractional_left,
                     self.fractional_center,
                     self.fractional_right
-                ]) * np.linalg.norm(v) ** 2)
+                ]) * input_power)
             prop_data.append(np.stack(prop_col_data))
         prop_data = np.hstack(prop_data)
         return prop_data.transpose((1, 0, 2))
@@ -221,7 +221,9 @@ class XCamera:
         if error != 0:
             raise RuntimeError(f'Camera Error: {errcodes[error]}')
 
-        return frame  if self.background_reference is None else frame.astype(np.float) - self.background_reference.astype(np.float)
+        if self.background_reference is None:
+            return frame
+        return np.subtract(frame, self.background_reference, dtype=np.float64)
 
     def set_integration_time(self, integration_time: int):
         self.integration_time = integration_time
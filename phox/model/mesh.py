@@ -22,8 +22,9 @@ def beta_pdf(x, a, b):
 
 
 def beta_phase(theta, a, b):
+    # sin(theta / 2) * cos(theta / 2) = sin(theta) / 2
     x = np.cos(theta / 2) ** 2
-    return np.abs(beta_pdf(x, a, b) * np.sin(theta / 2) * np.cos(theta / 2) / np.pi)
+    return np.abs(beta_pdf(x, a, b) * np.sin(theta) / (2 * np.pi))
 
 
 class MeshConfig:
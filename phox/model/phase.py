@@ -168,8 +168,10 @@ class PhaseCalibration:
         idx_pi = self.top_peaks[0]
         idx_0, idx_2pi = self.bottom_peaks[0], self.bottom_peaks[1]
         if isinstance(phase, np.ndarray):
-            phase_pi = phase[phase >= np.pi]
-            phase_0 = phase[phase < np.pi]
+            is_pi = phase >= np.pi
+            is_0 = phase < np.pi
+            phase_pi = phase[is_pi]
+            phase_0 = phase[is_0]
             i_0 = np.argmin(
                 np.abs(np.sin(phase_0[:, np.newaxis] / 2) ** 2 - sr[idx_0:idx_pi][np.newaxis, :]), axis=1)
             i_pi = np.argmin(
@@ -177,8 +179,8 @@ class PhaseCalibration:
             v_0 = self.vs[idx_0 + i_0]
             v_pi = self.vs[idx_pi + i_pi]
             v = np.zeros_like(phase)
-            v[phase >= np.pi] = v_pi
-            v[phase < np.pi] = v_0
+            v[is_pi] = v_pi
+            v[is_0] = v_0
         else:
             if 0 <= phase < np.pi:
                 v = self.vs[idx_0 + np.argmin(np.abs(np.sin(phase / 2) ** 2 - sr[idx_0:idx_pi]))]
@@ -191,8 +193,9 @@ def cal_v_power(v, a, b, p0, p1, p2, p3):
     # take the absolute value of a to ensure a is positive!
     # need to also take absolute value of p3
     # ensure that the shifted phase always goes from +0 to +np.pi to ensure it is within desired range
-    return np.abs(a) * np.sin(p0 * v ** 3 + p1 * v ** 2 + p2 * v - np.abs(p3)) ** 2 + b
+    # cubic in Horner form: three multiply-adds, no power calls
+    return np.abs(a) * np.sin(((p0 * v + p1) * v + p2) * v - np.abs(p3)) ** 2 + b
 
 
 def cal_phase_v(x, q0, q1, q2, q3):
-    return q0 * x ** 3 + q1 * x ** 2 + q2 * x + q3
+    return ((q0 * x + q1) * x + q2) * x + q3
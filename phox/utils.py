@@ -44,10 +44,11 @@ def phases_to_vector(thetas: Arraylike, phis: Arraylike, lower_theta: Arraylike,
 
     """
     n = len(thetas)
-    v = np.zeros(n + 1)
+    v = np.zeros(n + 1, dtype=np.complex128)
     v[0] = 1
     for i in range(n):
         theta, phi = thetas[i], phis[i]
-        v = v @ SMMZI(theta, phi, hadamard=False, lower_theta=lower_theta[i],
-                      lower_phi=lower_phi[i]).givens_rotation(n + 1, i)
+        # each MZI only mixes modes i and i + 1
+        v[i:i + 2] = v[i:i + 2] @ SMMZI(theta, phi, hadamard=False, lower_theta=lower_theta[i],
+                                        lower_phi=lower_phi[i]).matrix
     return v.conj()
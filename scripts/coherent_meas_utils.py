@@ -1,4 +1,6 @@
 from tqdm import tqdm
+import cmath
+import math
 import time
 import numpy as np
 import os
@@ -33,9 +35,7 @@ class CoherentMeas:
         """
         get phase measurement result for single phase sensor
         """
-        pu = np.arctan2((powers[1, 0] - powers[3, 0]), \
-                        (powers[0, 0] - powers[2, 0])) - np.pi
-        pd = np.arctan2((powers[1, 1] - powers[3, 1]), \
+        pd = math.atan2((powers[1, 1] - powers[3, 1]), \
                         (powers[0, 1] - powers[2, 1])) - np.pi
         return pd
 
@@ -120,7 +120,7 @@ class CoherentMeas:
         phi = self.get_phi_down(powers[:, row2 - 1:row2 + 1])
         self.chip.ps[(col1, row1)].phase = phi + np.pi
         time.sleep(0.05)
-        theta = 2 * np.arctan2(inp_power[row2], inp_power[row2 - 1])
+        theta = 2 * math.atan2(inp_power[row2], inp_power[row2 - 1])
         self.chip.ps[(col2, row2)].phase = theta + np.pi
         time.sleep(0.05)
 
@@ -155,10 +155,10 @@ class CoherentMeas:
             theta = phase_save[(col2, row2)]
 
         if col == 12:
-            H1 = np.asarray([[np.exp(-1j * phi), 0], [0, 1]])
+            H1 = np.asarray([[cmath.exp(-1j * phi), 0], [0, 1]])
         else:
-            H1 = np.asarray([[1, 0], [0, np.exp(-1j * phi)]])
-        H2 = np.asarray([[1, 0], [0, np.exp(-1j * theta)]])
+            H1 = np.asarray([[1, 0], [0, cmath.exp(-1j * phi)]])
+        H2 = np.asarray([[1, 0], [0, cmath.exp(-1j * theta)]])
         B = np.asarray([[1, -1j], [-1j, 1]]) / np.sqrt(2)
         M = H1 @ B @ H2 @ B
         out_field = M @ np.asarray([inp_field, 0]).astype(np.complex64)